@@ -7,7 +7,10 @@ import plotly.express as px
 import pytz
 import requests
 from utils.cgpa_calc import calculate_cgpa
-from utils.helpers import get_subject_color, load_data, save_data
+from utils.helpers import data_version, get_subject_color, load_data, save_data
+from utils.summary import get_summary
+from utils.courses import DEFAULT_COMPONENTS, add_course, course_grade, course_names, get_course, update_course
+from utils.focus import daily_series, load_rollups, record_session_event, subject_series, weekly_series
 import streamlit.components.v1 as components
 
 # Configuration
@@ -19,9 +22,13 @@ st.set_page_config(
 )
 
 # Load custom CSS
-def load_css():
+@st.cache_data
+def read_css():
     with open("assets/styles.css") as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+        return f.read()
+
+def load_css():
+    st.markdown(f"<style>{read_css()}</style>", unsafe_allow_html=True)
 
 load_css()
 
@@ -34,6 +41,439 @@ if 'timer_running' not in st.session_state:
     st.session_state.timer_start = None
     st.session_state.timer_duration = 25 * 60  # 25 minutes in seconds
 
+# Cached reads, keyed on the file version so any save invalidates them.
+# Only the latest version is ever read, so older copies are evicted quickly.
+@st.cache_data(max_entries=8)
+def load_versioned(filename, version):
+    return load_data(filename)
+
+def load_cached(filename):
+    return load_versioned(filename, data_version(filename))
+
+@st.cache_data(max_entries=2)
+def calendar_events_json(version):
+    return json.dumps([{
+        'title': e['title'],
+        'start': e['date'],
+        'description': e.get('description', ''),
+        'color': '#4285F4' if 'exam' in e['title'].lower() else '#34A853'
+    } for e in load_data("events")])
+
+def toggle_task_completion(index):
+    task = st.session_state.tasks[index]
+    task['completed'] = not task.get('completed', False)
+    if task['completed']:
+        task['completed_at'] = datetime.now().strftime("%Y-%m-%d %H:%M")
+    else:
+        task.pop('completed_at', None)
+    save_data("tasks", st.session_state.tasks)
+
+def stop_running_timer():
+    """Log the running timer as stopped and return how many seconds it ran"""
+    elapsed = (datetime.now() - st.session_state.timer_start).total_seconds()
+    record_session_event("stopped", st.session_state.timer_type, st.session_state.timer_subject,
+                         st.session_state.timer_duration, elapsed)
+    st.session_state.timer_running = False
+    return elapsed
+
+# Page sections, each rerunnable on its own as a fragment
+@st.fragment(run_every=1)
+def render_timer_display(timer_type, done_message):
+    """Countdown for the running timer; reruns every second without rerunning the page"""
+    if not (st.session_state.timer_running and st.session_state.get('timer_type') == timer_type):
+        if st.session_state.get('timer_finished') == timer_type:
+            st.success(done_message)
+        return
+    
+    elapsed = (datetime.now() - st.session_state.timer_start).total_seconds()
+    remaining = max(0, st.session_state.timer_duration - elapsed)
+    
+    minutes, seconds = divmod(int(remaining), 60)
+    progress = min(1.0, elapsed / st.session_state.timer_duration)
+    
+    if remaining <= 0:
+        st.balloons()
+        st.success(done_message)
+        record_session_event("completed", st.session_state.timer_type, st.session_state.timer_subject,
+                             st.session_state.timer_duration, st.session_state.timer_duration)
+        st.session_state.timer_running = False
+        st.session_state.timer_finished = timer_type
+    else:
+        st.progress(progress, text=f"⏳ {minutes:02d}:{seconds:02d} remaining")
+
+
+@st.fragment
+def render_calendar():
+    """Calendar tab; switching view modes only reruns this section"""
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.subheader("Interactive Calendar")
+    with col2:
+        view_option = st.selectbox("View Mode", ["Monthly", "Weekly", "Daily"], index=0)
+    
+    if view_option == "Monthly":
+        # Enhanced calendar view with interactive elements
+        calendar_html = """
+        <div id='calendar'></div>
+        <link href='https://cdn.jsdelivr.net/npm/fullcalendar@5.11.3/main.min.css' rel='stylesheet'>
+        <script src='https://cdn.jsdelivr.net/npm/fullcalendar@5.11.3/main.min.js'></script>
+        <script>
+            document.addEventListener('DOMContentLoaded', function() {
+                var calendarEl = document.getElementById('calendar');
+                var calendar = new FullCalendar.Calendar(calendarEl, {
+                    initialView: 'dayGridMonth',
+                    headerToolbar: {
+                        left: 'prev,next today',
+                        center: 'title',
+                        right: 'dayGridMonth,timeGridWeek,timeGridDay'
+                    },
+                    events: """ + calendar_events_json(data_version("events")) + """,
+                    eventClick: function(info) {
+                        const eventDesc = info.event.extendedProps.description;
+                        const eventDate = info.event.start.toLocaleDateString();
+                        alert(info.event.title + '\\n' + eventDate + '\\n\\n' + eventDesc);
+                    }
+                });
+                calendar.render();
+            });
+        </script>
+        """
+        components.html(calendar_html, height=600)
+    
+    elif view_option == "Weekly":
+        st.image("https://via.placeholder.com/800x400?text=Weekly+View+with+Time+Slots", use_column_width=True)
+    else:
+        selected_date = st.date_input("Select Date", datetime.now())
+        st.write(f"### Schedule for {selected_date.strftime('%A, %B %d, %Y')}")
+        daily_events = [e for e in st.session_state.events if e['date'] == selected_date.strftime("%Y-%m-%d")]
+    
+        if not daily_events:
+            st.info("No events scheduled for this day")
+        else:
+            for event in daily_events:
+                with st.expander(f"⏰ {event['time'] if 'time' in event else 'All Day'} - {event['title']}"):
+                    st.write(event.get('description', ''))
+                    if 'location' in event:
+                        st.write(f"📍 {event['location']}")
+                    if 'link' in event:
+                        st.markdown(f"[🔗 Event Link]({event['link']})")
+                    if st.button("Delete", key=f"del_{event['date']}_{event['title']}"):
+                        st.session_state.events.remove(event)
+                        save_data("events", st.session_state.events)
+                        st.rerun()
+
+
+@st.fragment
+def render_event_list():
+    """Upcoming events with per-event priority and delete controls"""
+    st.subheader("Upcoming Events")
+    
+    # Filter and sorting options
+    col1, col2 = st.columns(2)
+    with col1:
+        sort_option = st.selectbox("Sort by", ["Date", "Priority", "Title"], index=0)
+    with col2:
+        filter_option = st.multiselect("Filter by type", ["Exam", "Assignment", "Lecture", "Other"], default=["Exam", "Assignment"])
+    
+    # Priority tagging and filtering
+    for event in st.session_state.events:
+        if 'priority' not in event:
+            event['priority'] = "Medium"
+    
+    sorted_events = sorted(st.session_state.events, key=lambda x: (
+        datetime.strptime(x['date'], "%Y-%m-%d"),
+        {"High": 0, "Medium": 1, "Low": 2}[x['priority']]
+    ))
+    
+    for event in sorted_events:
+        event_date = datetime.strptime(event['date'], "%Y-%m-%d")
+        days_left = (event_date - datetime.now()).days
+    
+        # Skip past events and apply filters
+        if days_left >= 0 and (not filter_option or any(ft.lower() in event['title'].lower() for ft in filter_option)):
+            with st.container(border=True):
+                # Color code based on priority
+                priority_color = "red" if event['priority'] == "High" else "orange" if event['priority'] == "Medium" else "green"
+    
+                col1, col2, col3 = st.columns([1, 4, 1])
+                with col1:
+                    st.markdown(f":{priority_color}[●] **{event_date.strftime('%d %b')}**")
+                    st.caption(f"{'⏰' if 'time' in event else '📅'} {days_left}d")
+                with col2:
+                    st.subheader(event['title'])
+                    st.caption(event.get('description', ''))
+                    if event.get('link'):
+                        st.markdown(f"[More info]({event['link']})")
+                    if 'location' in event:
+                        st.caption(f"📍 {event['location']}")
+                with col3:
+                    with st.popover("⚙️"):
+                        new_priority = st.selectbox(
+                            "Priority", 
+                            ["High", "Medium", "Low"], 
+                            index=["High", "Medium", "Low"].index(event['priority']),
+                            key=f"priority_{event['date']}_{event['title']}"
+                        )
+                        if new_priority != event['priority']:
+                            event['priority'] = new_priority
+                            save_data("events", st.session_state.events)
+                            st.rerun(scope="fragment")
+    
+                        if st.button("Delete", key=f"delete_{event['date']}_{event['title']}"):
+                            st.session_state.events.remove(event)
+                            save_data("events", st.session_state.events)
+                            st.rerun()
+
+
+@st.fragment
+def render_progress_tracker():
+    """Course selection and grade calculator"""
+    st.subheader("Academic Progress Tracker")
+    
+    # Course management
+    st.write("### Course Management")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selected_course = st.selectbox("Select Course", course_names() + ["Add New Course"])
+    with col2:
+        if selected_course == "Add New Course":
+            with st.popover("➕ New Course"):
+                with st.form("add_course"):
+                    course_name = st.text_input("Course Name")
+                    course_code = st.text_input("Course Code")
+                    credit_hours = st.number_input("Credit Hours", min_value=1, max_value=5, value=3)
+                    if st.form_submit_button("Add"):
+                        try:
+                            add_course(course_name, course_code, credit_hours)
+                            st.rerun(scope="fragment")
+                        except ValueError as e:
+                            st.error(str(e))
+    
+    if selected_course and selected_course != "Add New Course":
+        course = get_course(selected_course)
+        if course:
+            st.write(f"**Course Code:** {course['code']} | **Credits:** {course['credits']}")
+            grade_components = course.get('components', DEFAULT_COMPONENTS)
+    
+            # Grade components
+            with st.expander("⚙️ Grade Components"):
+                edited = st.data_editor(
+                    pd.DataFrame(grade_components, columns=['name', 'weight', 'target']),
+                    column_config={
+                        'name': st.column_config.TextColumn("Component", required=True),
+                        'weight': st.column_config.NumberColumn("Weight (%)", min_value=0, max_value=100),
+                        'target': st.column_config.NumberColumn("Target", min_value=0, max_value=100),
+                    },
+                    num_rows="dynamic",
+                    hide_index=True,
+                    key=f"components_{course['code']}"
+                )
+                if st.button("Save Components", key=f"save_components_{course['code']}"):
+                    rows = edited.dropna(subset=['name']).fillna(0).to_dict("records")
+                    try:
+                        update_course(course['code'], components=[
+                            {'name': r['name'], 'weight': r['weight'], 'target': r['target']} for r in rows
+                        ])
+                        st.rerun(scope="fragment")
+                    except ValueError as e:
+                        st.error(str(e))
+    
+            # Grade tracker
+            st.write("### Grade Calculator")
+            saved_scores = course.get('scores', {})
+            scores = {}
+            cols = st.columns(max(1, len(grade_components)))
+            for i, component in enumerate(grade_components):
+                with cols[i]:
+                    scores[component['name']] = st.number_input(
+                        f"{component['name']} Score", min_value=0, max_value=100,
+                        value=int(saved_scores.get(component['name'], 0)),
+                        key=f"score_{course['code']}_{component['name']}"
+                    )
+    
+            # Only this course's cached grade is recomputed, and only when a score changes
+            if any(value != saved_scores.get(name, 0) for name, value in scores.items()):
+                # Keep rendering from the record update_course wrote, not the one read above
+                course = update_course(course['code'], scores=scores)
+    
+            weights_help = ", ".join(f"{c['name']} {c['weight']:g}%" for c in grade_components)
+            st.metric("Overall Grade", f"{course_grade(course):.1f}%",
+                     help=f"Weights: {weights_help}")
+    
+            # Progress visualization
+            st.write("### Progress Overview")
+            progress_data = pd.DataFrame({
+                'Component': [c['name'] for c in grade_components],
+                'Score': [scores[c['name']] for c in grade_components],
+                'Target': [c['target'] for c in grade_components]
+            })
+    
+            # Visualization with fallback
+            try:
+                fig = px.bar(progress_data, x='Component', y=['Score', 'Target'], 
+                            barmode='group', title="Performance vs Targets")
+                st.plotly_chart(fig, use_container_width=True)
+            except NameError:  # If plotly not available
+                st.bar_chart(progress_data.set_index('Component'))
+                st.write("*Install plotly for enhanced visualizations*")
+
+
+@st.fragment
+def render_notes_grid():
+    """Searchable grid of course notes"""
+    st.subheader("Course Notes")
+    
+    # Load notes data with error handling
+    try:
+        notes = load_cached("notes")
+    except:
+        notes = {}
+        st.warning("Could not load notes data. Initializing empty notes collection.")
+    
+    # Search and sort controls
+    col1, col2 = st.columns(2)
+    with col1:
+        search_term = st.text_input("🔍 Search Notes", "")
+    with col2:
+        sort_option = st.selectbox("Sort By", ["Subject A-Z", "Recent First", "Course Code"])
+    
+    # Filter and sort notes
+    notes_to_display = [
+        (subject, note_data) 
+        for subject, note_data in notes.items() 
+        if search_term.lower() in subject.lower()
+    ]
+    
+    if sort_option == "Recent First":
+        notes_to_display.sort(key=lambda x: x[1].get('date', ''), reverse=True)
+    elif sort_option == "Course Code":
+        notes_to_display.sort(key=lambda x: x[1].get('code', ''))
+    else:  # Default A-Z
+        notes_to_display.sort(key=lambda x: x[0])
+
+    # Display notes in 2-column grid
+    cols = st.columns(2)
+    for i, (subject, note_data) in enumerate(notes_to_display):
+        with cols[i % 2]:
+            with st.container(border=True):
+                # Note header with colored subject
+                st.markdown(f"<h4 style='color: {get_subject_color(subject)}'>{subject}</h4>", 
+                           unsafe_allow_html=True)
+    
+                # Metadata
+                st.caption(f"📅 {note_data.get('date', 'No date')} | 🏷️ {note_data.get('tags', '')}")
+    
+                # Description
+                st.write(note_data.get('description', 'Study notes available'))
+    
+                # Download button if link exists
+                if "link" in note_data:
+                    st.download_button(
+                        label="Download PDF",
+                        data=note_data["link"],
+                        file_name=f"{subject.replace(' ', '_')}.pdf",
+                        mime="application/pdf"
+                    )
+                else:
+                    st.warning("No file attached")
+    
+                # Delete button
+                if st.button("Delete Note", key=f"del_note_{subject}"):
+                    del notes[subject]
+                    save_data("notes", notes)
+                    st.rerun(scope="fragment")
+
+
+@st.fragment
+def render_task_list():
+    """Task list; ticking a checkbox only rerenders this section"""
+    # Task list
+    st.markdown("---")
+    st.subheader("📋 Your Tasks")
+    
+    if not st.session_state.tasks:
+        st.info("No tasks yet. Add some tasks to get started!")
+    else:
+        # Filter options
+        col1, col2 = st.columns(2)
+        with col1:
+            show_completed = st.checkbox("Show completed tasks", value=False)
+        with col2:
+            sort_by = st.selectbox("Sort by", ["Priority", "Due Date"])
+    
+        # Filter tasks and handle missing due_date, keeping each task's position in the full list
+        filtered_tasks = []
+        for idx, t in enumerate(st.session_state.tasks):
+            if show_completed or not t.get('completed', False):
+                # Add default due_date if missing
+                if 'due_date' not in t:
+                    t['due_date'] = datetime.now().strftime("%Y-%m-%d")
+                filtered_tasks.append((idx, t))
+    
+        # Sort tasks with error handling
+        try:
+            if sort_by == "Priority":
+                priority_order = {"🔴 High": 0, "🟡 Medium": 1, "🟢 Low": 2}
+                filtered_tasks.sort(key=lambda x: priority_order[x[1].get('priority', '🟢 Low')])
+            else:
+                filtered_tasks.sort(key=lambda x: x[1].get('due_date', datetime.now().strftime("%Y-%m-%d")))
+        except Exception as e:
+            st.error(f"Error sorting tasks: {e}")
+    
+        # Display tasks with proper error handling
+        for i, (task_index, task) in enumerate(filtered_tasks):
+            task_key = f"task_{i}"
+            with st.container(border=True):
+                col1, col2 = st.columns([1, 20])
+                with col1:
+                    completed = st.checkbox(
+                        "", 
+                        value=task.get('completed', False), 
+                        key=f"complete_{task_key}",
+                        on_change=toggle_task_completion,
+                        args=(task_index,)
+                    )
+                with col2:
+                    # Safely get task properties with defaults
+                    task_text = task.get('task', 'Untitled task')
+                    task_priority = task.get('priority', '🟢 Low')
+    
+                    if task.get('completed', False):
+                        st.markdown(f"<s>{task_priority} {task_text}</s>", unsafe_allow_html=True)
+                    else:
+                        st.markdown(f"**{task_priority} {task_text}**")
+    
+                    # Handle due date with proper error checking
+                    try:
+                        due_date_str = task.get('due_date', datetime.now().strftime("%Y-%m-%d"))
+                        due_date = datetime.strptime(due_date_str, "%Y-%m-%d").date()
+                        days_left = (due_date - datetime.now().date()).days
+    
+                        if days_left < 0:
+                            status = f"❌ Overdue by {-days_left} days"
+                        elif days_left == 0:
+                            status = "⚠️ Due today"
+                        elif days_left <= 3:
+                            status = f"⚠️ Due in {days_left} days"
+                        else:
+                            status = f"📅 Due in {days_left} days"
+                    except Exception as e:
+                        status = "⚠️ Date error"
+                        st.error(f"Error processing date for task: {e}")
+    
+                    created_time = task.get('created', 'Unknown time')
+                    st.caption(f"{status} | Created: {created_time}")
+    
+                if st.button("🗑️", key=f"delete_{task_key}"):
+                    try:
+                        st.session_state.tasks.pop(task_index)
+                        save_data("tasks", st.session_state.tasks)
+                        st.rerun(scope="fragment")
+                    except Exception as e:
+                        st.error(f"Error deleting task: {e}")
+
+
 # Menu options
 menu = [
     "🏠 Dashboard", 
@@ -77,19 +517,27 @@ if choice == "🏠 Dashboard":
     
     # Quick stats
     st.subheader("📊 Your Stats")
+    summary = get_summary()
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        notes = load_data("notes")
-        st.metric("📝 Available Notes", len(notes))
+        st.metric("📝 Available Notes", summary['notes'])
     with col2:
-        pending = sum(1 for t in st.session_state.tasks if not t.get('completed', False))
-        st.metric("✅ Pending Tasks", pending)
+        st.metric("✅ Pending Tasks", summary['pending_tasks'],
+                  delta=f"{summary['overdue_tasks']} overdue" if summary['overdue_tasks'] else None,
+                  delta_color="inverse")
+        if summary['next_deadline']:
+            st.caption(f"Next deadline: {summary['next_deadline']}")
     with col3:
-        events = load_data("events")
-        upcoming = sum(1 for e in events if datetime.strptime(e['date'], "%Y-%m-%d") >= datetime.now())
-        st.metric("📅 Upcoming Events", upcoming)
+        st.metric("📅 Upcoming Events", summary['upcoming_events'])
+        if summary['next_event']:
+            st.caption(f"Next event: {summary['next_event']}")
     with col4:
-        st.metric("🎯 Productivity Score", f"{min(100, pending*10)}%")
+        rate_7d = summary['completion_rate_7d']
+        rate_30d = summary['completion_rate_30d']
+        st.metric("🎯 Productivity Score", f"{rate_7d}%" if rate_7d is not None else "—",
+                  help="Share of tasks due or completed in the last 7 days that are done")
+        if rate_30d is not None:
+            st.caption(f"30-day completion: {rate_30d}%")
 
     # Motivational quote
     try:
@@ -111,124 +559,10 @@ elif choice == "📅 Academic Planner":
         st.session_state.events = load_data("events")
     
     with tab1:
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.subheader("Interactive Calendar")
-        with col2:
-            view_option = st.selectbox("View Mode", ["Monthly", "Weekly", "Daily"], index=0)
-        
-        if view_option == "Monthly":
-            # Enhanced calendar view with interactive elements
-            calendar_html = """
-            <div id='calendar'></div>
-            <link href='https://cdn.jsdelivr.net/npm/fullcalendar@5.11.3/main.min.css' rel='stylesheet'>
-            <script src='https://cdn.jsdelivr.net/npm/fullcalendar@5.11.3/main.min.js'></script>
-            <script>
-                document.addEventListener('DOMContentLoaded', function() {
-                    var calendarEl = document.getElementById('calendar');
-                    var calendar = new FullCalendar.Calendar(calendarEl, {
-                        initialView: 'dayGridMonth',
-                        headerToolbar: {
-                            left: 'prev,next today',
-                            center: 'title',
-                            right: 'dayGridMonth,timeGridWeek,timeGridDay'
-                        },
-                        events: """ + json.dumps([{
-                            'title': e['title'],
-                            'start': e['date'],
-                            'description': e.get('description', ''),
-                            'color': '#4285F4' if 'exam' in e['title'].lower() else '#34A853'
-                        } for e in st.session_state.events]) + """,
-                        eventClick: function(info) {
-                            const eventDesc = info.event.extendedProps.description;
-                            const eventDate = info.event.start.toLocaleDateString();
-                            alert(info.event.title + '\\n' + eventDate + '\\n\\n' + eventDesc);
-                        }
-                    });
-                    calendar.render();
-                });
-            </script>
-            """
-            components.html(calendar_html, height=600)
-            
-        elif view_option == "Weekly":
-            st.image("https://via.placeholder.com/800x400?text=Weekly+View+with+Time+Slots", use_column_width=True)
-        else:
-            selected_date = st.date_input("Select Date", datetime.now())
-            st.write(f"### Schedule for {selected_date.strftime('%A, %B %d, %Y')}")
-            daily_events = [e for e in st.session_state.events if e['date'] == selected_date.strftime("%Y-%m-%d")]
-            
-            if not daily_events:
-                st.info("No events scheduled for this day")
-            else:
-                for event in daily_events:
-                    with st.expander(f"⏰ {event['time'] if 'time' in event else 'All Day'} - {event['title']}"):
-                        st.write(event.get('description', ''))
-                        if 'location' in event:
-                            st.write(f"📍 {event['location']}")
-                        if 'link' in event:
-                            st.markdown(f"[🔗 Event Link]({event['link']})")
-                        if st.button("Delete", key=f"del_{event['date']}_{event['title']}"):
-                            st.session_state.events.remove(event)
-                            st.rerun()
+        render_calendar()
     
     with tab2:
-        st.subheader("Upcoming Events")
-        
-        # Filter and sorting options
-        col1, col2 = st.columns(2)
-        with col1:
-            sort_option = st.selectbox("Sort by", ["Date", "Priority", "Title"], index=0)
-        with col2:
-            filter_option = st.multiselect("Filter by type", ["Exam", "Assignment", "Lecture", "Other"], default=["Exam", "Assignment"])
-        
-        # Priority tagging and filtering
-        for event in st.session_state.events:
-            if 'priority' not in event:
-                event['priority'] = "Medium"
-        
-        sorted_events = sorted(st.session_state.events, key=lambda x: (
-            datetime.strptime(x['date'], "%Y-%m-%d"),
-            {"High": 0, "Medium": 1, "Low": 2}[x['priority']]
-        ))
-        
-        for event in sorted_events:
-            event_date = datetime.strptime(event['date'], "%Y-%m-%d")
-            days_left = (event_date - datetime.now()).days
-            
-            # Skip past events and apply filters
-            if days_left >= 0 and (not filter_option or any(ft.lower() in event['title'].lower() for ft in filter_option)):
-                with st.container(border=True):
-                    # Color code based on priority
-                    border_color = "#FF0000" if event['priority'] == "High" else "#FFA500" if event['priority'] == "Medium" else "#008000"
-                    st.markdown(f"""<style> div[data-testid="stVerticalBlockBorderWrapper"] {{ border-left: 5px solid {border_color}; }} </style>""", unsafe_allow_html=True)
-                    
-                    col1, col2, col3 = st.columns([1, 4, 1])
-                    with col1:
-                        st.markdown(f"**{event_date.strftime('%d %b')}**")
-                        st.caption(f"{'⏰' if 'time' in event else '📅'} {days_left}d")
-                    with col2:
-                        st.subheader(event['title'])
-                        st.caption(event.get('description', ''))
-                        if event.get('link'):
-                            st.markdown(f"[More info]({event['link']})")
-                        if 'location' in event:
-                            st.caption(f"📍 {event['location']}")
-                    with col3:
-                        with st.popover("⚙️"):
-                            new_priority = st.selectbox(
-                                "Priority", 
-                                ["High", "Medium", "Low"], 
-                                index=["High", "Medium", "Low"].index(event['priority']),
-                                key=f"priority_{event['date']}_{event['title']}"
-                            )
-                            if new_priority != event['priority']:
-                                event['priority'] = new_priority
-                                st.rerun()
-                            
-                            if st.button("Delete", key=f"delete_{event['date']}_{event['title']}"):
-                                st.session_state.events.remove(event)
-                                st.rerun()
+        render_event_list()
     
     with tab3:
         st.subheader("Add New Event")
@@ -267,79 +601,12 @@ elif choice == "📅 Academic Planner":
                         new_event['location'] = event_location
                     
                     st.session_state.events.append(new_event)
+                    save_data("events", st.session_state.events)
                     st.success("Event added successfully!")
                     st.balloons()
     
-with tab4:
-    st.subheader("Academic Progress Tracker")
-    
-    # Course management
-    st.write("### Course Management")
-    courses = load_data("courses")
-    
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        selected_course = st.selectbox("Select Course", [c['name'] for c in courses] + ["Add New Course"])
-    with col2:
-        if selected_course == "Add New Course":
-            with st.popover("➕ New Course"):
-                with st.form("add_course"):
-                    course_name = st.text_input("Course Name")
-                    course_code = st.text_input("Course Code")
-                    credit_hours = st.number_input("Credit Hours", min_value=1, max_value=5, value=3)
-                    if st.form_submit_button("Add"):
-                        courses.append({
-                            'name': course_name,
-                            'code': course_code,
-                            'credits': credit_hours
-                        })
-                        st.rerun()
-    
-    if selected_course and selected_course != "Add New Course":
-        course = next((c for c in courses if c['name'] == selected_course), None)
-        if course:
-            st.write(f"**Course Code:** {course['code']} | **Credits:** {course['credits']}")
-            
-            # Grade tracker
-            st.write("### Grade Calculator")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                assignments = st.number_input("Assignments Score", min_value=0, max_value=100, value=85)
-            with col2:
-                midterm = st.number_input("Midterm Score", min_value=0, max_value=100, value=75)
-            with col3:
-                final = st.number_input("Final Exam Score", min_value=0, max_value=100, value=80)
-            
-            weights = {
-                'assignments': 0.4,
-                'midterm': 0.3,
-                'final': 0.3
-            }
-            
-            total_score = (assignments * weights['assignments'] + 
-                         midterm * weights['midterm'] + 
-                         final * weights['final'])
-            
-            st.metric("Overall Grade", f"{total_score:.1f}%", 
-                     help="Weights: Assignments 40%, Midterm 30%, Final 30%")
-            
-            # Progress visualization
-            st.write("### Progress Overview")
-            progress_data = pd.DataFrame({
-                'Component': ['Assignments', 'Midterm', 'Final'],
-                'Score': [assignments, midterm, final],
-                'Target': [90, 80, 80]
-            })
-            
-            # Visualization with fallback
-            try:
-                fig = px.bar(progress_data, x='Component', y=['Score', 'Target'], 
-                            barmode='group', title="Performance vs Targets")
-                st.plotly_chart(fig, use_container_width=True)
-            except NameError:  # If plotly not available
-                st.bar_chart(progress_data.set_index('Component'))
-                st.write("*Install plotly for enhanced visualizations*")
-# Study Hub
+    with tab4:
+        render_progress_tracker()
 elif choice == "📚 Study Hub":
     st.title("📚 Study Hub")
     
@@ -347,67 +614,7 @@ elif choice == "📚 Study Hub":
     tab1 = st.tabs(["📝 Notes"])[0]  # Get first (and only) tab
     
     with tab1:
-        st.subheader("Course Notes")
-        
-        # Load notes data with error handling
-        try:
-            notes = load_data("notes")
-        except:
-            notes = {}
-            st.warning("Could not load notes data. Initializing empty notes collection.")
-        
-        # Search and sort controls
-        col1, col2 = st.columns(2)
-        with col1:
-            search_term = st.text_input("🔍 Search Notes", "")
-        with col2:
-            sort_option = st.selectbox("Sort By", ["Subject A-Z", "Recent First", "Course Code"])
-        
-        # Filter and sort notes
-        notes_to_display = [
-            (subject, note_data) 
-            for subject, note_data in notes.items() 
-            if search_term.lower() in subject.lower()
-        ]
-        
-        if sort_option == "Recent First":
-            notes_to_display.sort(key=lambda x: x[1].get('date', ''), reverse=True)
-        elif sort_option == "Course Code":
-            notes_to_display.sort(key=lambda x: x[1].get('code', ''))
-        else:  # Default A-Z
-            notes_to_display.sort(key=lambda x: x[0])
-
-        # Display notes in 2-column grid
-        cols = st.columns(2)
-        for i, (subject, note_data) in enumerate(notes_to_display):
-            with cols[i % 2]:
-                with st.container(border=True):
-                    # Note header with colored subject
-                    st.markdown(f"<h4 style='color: {get_subject_color(subject)}'>{subject}</h4>", 
-                               unsafe_allow_html=True)
-                    
-                    # Metadata
-                    st.caption(f"📅 {note_data.get('date', 'No date')} | 🏷️ {note_data.get('tags', '')}")
-                    
-                    # Description
-                    st.write(note_data.get('description', 'Study notes available'))
-                    
-                    # Download button if link exists
-                    if "link" in note_data:
-                        st.download_button(
-                            label="Download PDF",
-                            data=note_data["link"],
-                            file_name=f"{subject.replace(' ', '_')}.pdf",
-                            mime="application/pdf"
-                        )
-                    else:
-                        st.warning("No file attached")
-                    
-                    # Delete button
-                    if st.button("Delete Note", key=f"del_note_{subject}"):
-                        del notes[subject]
-                        save_data("notes", notes)
-                        st.rerun()
+        render_notes_grid()
 # Performance Tracker
 elif choice == "📊 Performance":
     st.title("📊 Academic Performance")
@@ -491,98 +698,12 @@ elif choice == "✅ Task Manager":
             st.success("Task added!")
             st.rerun()
     
-    # Task list
-    st.markdown("---")
-    st.subheader("📋 Your Tasks")
-    
-    if not st.session_state.tasks:
-        st.info("No tasks yet. Add some tasks to get started!")
-    else:
-        # Filter options
-        col1, col2 = st.columns(2)
-        with col1:
-            show_completed = st.checkbox("Show completed tasks", value=False)
-        with col2:
-            sort_by = st.selectbox("Sort by", ["Priority", "Due Date"])
-        
-        # Filter tasks and handle missing due_date
-        filtered_tasks = []
-        for t in st.session_state.tasks:
-            if show_completed or not t.get('completed', False):
-                # Add default due_date if missing
-                if 'due_date' not in t:
-                    t['due_date'] = datetime.now().strftime("%Y-%m-%d")
-                filtered_tasks.append(t)
-        
-        # Sort tasks with error handling
-        try:
-            if sort_by == "Priority":
-                priority_order = {"🔴 High": 0, "🟡 Medium": 1, "🟢 Low": 2}
-                filtered_tasks.sort(key=lambda x: priority_order[x.get('priority', '🟢 Low')])
-            else:
-                filtered_tasks.sort(key=lambda x: x.get('due_date', datetime.now().strftime("%Y-%m-%d")))
-        except Exception as e:
-            st.error(f"Error sorting tasks: {e}")
-        
-        # Display tasks with proper error handling
-        for i, task in enumerate(filtered_tasks):
-            task_key = f"task_{i}"
-            with st.container(border=True):
-                col1, col2 = st.columns([1, 20])
-                with col1:
-                    completed = st.checkbox(
-                        "", 
-                        value=task.get('completed', False), 
-                        key=f"complete_{task_key}",
-                        on_change=lambda i=i: toggle_task_completion(i)
-                    )
-                with col2:
-                    # Safely get task properties with defaults
-                    task_text = task.get('task', 'Untitled task')
-                    task_priority = task.get('priority', '🟢 Low')
-                    
-                    if task.get('completed', False):
-                        st.markdown(f"<s>{task_priority} {task_text}</s>", unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"**{task_priority} {task_text}**")
-                    
-                    # Handle due date with proper error checking
-                    try:
-                        due_date_str = task.get('due_date', datetime.now().strftime("%Y-%m-%d"))
-                        due_date = datetime.strptime(due_date_str, "%Y-%m-%d").date()
-                        days_left = (due_date - datetime.now().date()).days
-                        
-                        if days_left < 0:
-                            status = f"❌ Overdue by {-days_left} days"
-                        elif days_left == 0:
-                            status = "⚠️ Due today"
-                        elif days_left <= 3:
-                            status = f"⚠️ Due in {days_left} days"
-                        else:
-                            status = f"📅 Due in {days_left} days"
-                    except Exception as e:
-                        status = "⚠️ Date error"
-                        st.error(f"Error processing date for task: {e}")
-                    
-                    created_time = task.get('created', 'Unknown time')
-                    st.caption(f"{status} | Created: {created_time}")
-                
-                if st.button("🗑️", key=f"delete_{task_key}"):
-                    try:
-                        # Find the actual index in the original tasks list
-                        original_index = next((idx for idx, t in enumerate(st.session_state.tasks) 
-                                            if t.get('created', '') == task.get('created', '')), None)
-                        if original_index is not None:
-                            st.session_state.tasks.pop(original_index)
-                            save_data("tasks", st.session_state.tasks)
-                            st.rerun()
-                    except Exception as e:
-                        st.error(f"Error deleting task: {e}")
+    render_task_list()
 # Focus Timer
 elif choice == "⏳ Focus Timer":
     st.title("⏳ Focus Timer")
     
-    tab1, tab2 = st.tabs(["🍅 Pomodoro", "⏱️ Custom Timer"])
+    tab1, tab2, tab3 = st.tabs(["🍅 Pomodoro", "⏱️ Custom Timer", "📈 Focus Stats"])
     
     # Initialize session state
     if 'timer_running' not in st.session_state:
@@ -594,6 +715,9 @@ elif choice == "⏳ Focus Timer":
             'last_update': None
         })
     
+    subject = st.text_input("📚 Subject", value=st.session_state.get('timer_subject') or "General",
+                            disabled=st.session_state.timer_running)
+    
     with tab1:
         st.subheader("Pomodoro Timer")
         st.markdown("""
@@ -606,41 +730,29 @@ elif choice == "⏳ Focus Timer":
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Start Pomodoro (25 min)"):
+                # Restarting closes out the previous session so it is not left open in the log
+                if st.session_state.timer_running:
+                    stop_running_timer()
                 st.session_state.update({
                     'timer_running': True,
                     'timer_start': datetime.now(),
                     'timer_duration': 25 * 60,
                     'timer_type': "Pomodoro",
+                    'timer_finished': None,
+                    'timer_subject': subject,
                     'last_update': datetime.now()
                 })
+                record_session_event("started", "Pomodoro", subject, 25 * 60)
         
         with col2:
             if st.button("Stop Timer"):
                 if st.session_state.timer_running:
-                    elapsed = (datetime.now() - st.session_state.timer_start).total_seconds()
+                    elapsed = stop_running_timer()
                     st.info(f"Stopped after {int(elapsed//60)} min {int(elapsed%60)} sec")
                 st.session_state.timer_running = False
         
-        # Timer display
-        pomodoro_display = st.empty()
-        
-        if st.session_state.timer_running and st.session_state.timer_type == "Pomodoro":
-            elapsed = (datetime.now() - st.session_state.timer_start).total_seconds()
-            remaining = max(0, st.session_state.timer_duration - elapsed)
-            
-            minutes, seconds = divmod(int(remaining), 60)
-            progress = min(1.0, elapsed / st.session_state.timer_duration)
-            
-            pomodoro_display.progress(progress, text=f"⏳ {minutes:02d}:{seconds:02d} remaining")
-            
-            if remaining <= 0:
-                st.balloons()
-                st.success("Time's up! Take a 5-minute break.")
-                st.session_state.timer_running = False
-                pomodoro_display.empty()
-            else:
-                time.sleep(0.1)
-                st.rerun()
+        # Timer display, ticking on its own so the other tabs still render
+        render_timer_display("Pomodoro", "Time's up! Take a 5-minute break.")
     
     with tab2:
         st.subheader("Custom Timer")
@@ -657,48 +769,65 @@ elif choice == "⏳ Focus Timer":
         with col1:
             if st.button("Start Custom Timer"):
                 if total_seconds > 0:
+                    if st.session_state.timer_running:
+                        stop_running_timer()
                     st.session_state.update({
                         'timer_running': True,
                         'timer_start': datetime.now(),
                         'timer_duration': total_seconds,
                         'timer_type': "Custom",
+                        'timer_finished': None,
+                        'timer_subject': subject,
                         'last_update': datetime.now()
                     })
+                    record_session_event("started", "Custom", subject, total_seconds)
                 else:
                     st.warning("Please set a valid time duration")
         
         with col2:
             if st.button("Stop Custom Timer"):
                 if st.session_state.timer_running:
-                    elapsed = (datetime.now() - st.session_state.timer_start).total_seconds()
+                    elapsed = stop_running_timer()
                     st.info(f"Stopped after {int(elapsed//60)} min {int(elapsed%60)} sec")
                 st.session_state.timer_running = False
         
-        # Timer display
-        custom_display = st.empty()
+        # Timer display, ticking on its own so the other tabs still render
+        render_timer_display("Custom", "Custom timer completed!")
+    
+    with tab3:
+        st.subheader("Focus Stats")
         
-        if st.session_state.timer_running and st.session_state.timer_type == "Custom":
-            elapsed = (datetime.now() - st.session_state.timer_start).total_seconds()
-            remaining = max(0, st.session_state.timer_duration - elapsed)
-            
-            minutes, seconds = divmod(int(remaining), 60)
-            progress = min(1.0, elapsed / st.session_state.timer_duration)
-            
-            custom_display.progress(progress, text=f"⏳ {minutes:02d}:{seconds:02d} remaining")
-            
-            if remaining <= 0:
-                st.balloons()
-                st.success("Custom timer completed!")
-                st.session_state.timer_running = False
-                custom_display.empty()
-            else:
-                time.sleep(0.1)
-                st.rerun()
+        rollups = load_rollups()
+        last_30 = daily_series(rollups, 30)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("⏱️ Focus Today", f"{last_30[-1]['seconds'] // 60} min")
+        with col2:
+            st.metric("📆 Last 7 Days", f"{sum(d['seconds'] for d in last_30[-7:]) // 60} min")
+        with col3:
+            st.metric("🍅 Completed (30d)", sum(d['completed'] for d in last_30))
+        
+        period = st.radio("View", ["Daily", "Weekly", "By Subject"], horizontal=True)
+        if period == "Daily":
+            series = last_30
+        elif period == "Weekly":
+            series = weekly_series(rollups, 12)
+        else:
+            series = subject_series(rollups)
+        
+        if not any(d['started'] for d in series):
+            st.info("No focus sessions recorded yet. Start a timer to build your history!")
+        else:
+            stats = pd.DataFrame(series)
+            stats['Minutes'] = stats['seconds'] / 60
+            fig = px.bar(stats, x='period', y='Minutes', hover_data=['started', 'completed', 'stopped'],
+                         labels={'period': period.replace("By ", "")}, title=f"{period} Focus Time")
+            st.plotly_chart(fig, use_container_width=True)
 # Quick Notes
 elif choice == "📝 Quick Notes":
     st.title("📝 Quick Notes")
     
-    notes = load_data("quick_notes")
+    notes = load_cached("quick_notes")
     current_note = st.text_area("Write your note here:", height=200)
     
     col1, col2 = st.columns(2)
@@ -734,7 +863,3 @@ st.markdown("""
     <p>📅 Last updated: {}</p>
 </div>
 """.format(datetime.now().strftime("%Y-%m-%d")), unsafe_allow_html=True)
-
-def toggle_task_completion(index):
-    st.session_state.tasks[index]['completed'] = not st.session_state.tasks[index]['completed']
-    save_data("tasks", st.session_state.tasks)
\ No newline at end of file
@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+from utils.helpers import load_data
+
+# Append-only log: one full course record per line, the last line for a code wins.
+# Adding a course or changing its scores appends a single line, so a write costs
+# the same with ten courses or ten thousand.
+COURSES_FILE = "data/courses.jsonl"
+
+DEFAULT_COMPONENTS = [
+    {'name': 'Assignments', 'weight': 40, 'target': 90},
+    {'name': 'Midterm', 'weight': 30, 'target': 80},
+    {'name': 'Final', 'weight': 30, 'target': 80},
+]
+
+# Parsed catalog shared by every rerun and session, refreshed when the file changes.
+# Sessions run on separate threads, so every read-modify-write holds the lock.
+_catalog = {'file': None, 'offset': 0, 'lines': 0, 'by_code': {}, 'by_name': {}, 'names': []}
+_lock = threading.RLock()
+
+
+def _file_id():
+    try:
+        st = os.stat(COURSES_FILE)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def _reset():
+    _catalog.update({'file': _file_id(), 'offset': 0, 'lines': 0, 'by_code': {}, 'by_name': {}, 'names': []})
+
+
+def _apply(course):
+    """Index a course record, replacing any earlier record with the same code"""
+    previous = _catalog['by_code'].get(course['code'])
+    if previous is None:
+        _catalog['names'].append(course['name'])
+    elif previous['name'] != course['name']:
+        _catalog['by_name'].pop(previous['name'], None)
+        _catalog['names'][_catalog['names'].index(previous['name'])] = course['name']
+    _catalog['by_code'][course['code']] = course
+    _catalog['by_name'][course['name']] = course
+
+
+def _read_new_lines():
+    """Fold in whatever other sessions appended since the last read"""
+    with open(COURSES_FILE, "rb") as f:
+        f.seek(_catalog['offset'])
+        chunk = f.read()
+    # Leave a line that is still being written for the next read
+    end = chunk.rfind(b"\n") + 1
+    for line in chunk[:end].splitlines():
+        if line.strip():
+            _apply(json.loads(line))
+            _catalog['lines'] += 1
+    _catalog['offset'] += end
+
+
+def _migrate_legacy():
+    """Carry over a catalog saved as data/courses.json before the log existed"""
+    legacy = load_data("courses")
+    if legacy and not os.path.exists(COURSES_FILE):
+        _rewrite(legacy)
+
+
+def _rewrite(courses):
+    """Replace the log with one line per course, written atomically"""
+    os.makedirs("data", exist_ok=True)
+    tmp = f"{COURSES_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        f.writelines(json.dumps(c, separators=(",", ":")) + "\n" for c in courses)
+    os.replace(tmp, COURSES_FILE)
+
+
+def _append(course):
+    os.makedirs("data", exist_ok=True)
+    with open(COURSES_FILE, "a") as f:
+        f.write(json.dumps(course, separators=(",", ":")) + "\n")
+    _read_new_lines()
+    # Compact once superseded records outnumber live ones; amortised O(1) per write
+    if _catalog['lines'] > 2 * len(_catalog['by_code']) + 100:
+        _rewrite(list(_catalog['by_code'].values()))
+        _reset()
+        _read_new_lines()
+
+
+def load_catalog():
+    """Return the course catalog, reading only lines appended since the last call"""
+    with _lock:
+        if _catalog['file'] is None:
+            _migrate_legacy()
+        file_id = _file_id()
+        if file_id != _catalog['file']:
+            # First load, or another process compacted the log
+            _reset()
+        if file_id is not None and os.path.getsize(COURSES_FILE) != _catalog['offset']:
+            _read_new_lines()
+        return _catalog
+
+
+def course_names():
+    with _lock:
+        return list(load_catalog()['names'])
+
+
+def get_course(key):
+    """Look a course up by code or name"""
+    with _lock:
+        catalog = load_catalog()
+        return catalog['by_code'].get(key) or catalog['by_name'].get(key)
+
+
+def compute_grade(components, scores):
+    """Weighted score out of 100; weights are normalised so they need not sum to 100"""
+    total_weight = sum(c['weight'] for c in components)
+    if not total_weight:
+        return 0.0
+    weighted_sum = sum(scores.get(c['name'], 0) * c['weight'] for c in components)
+    return weighted_sum / total_weight
+
+
+def _clean_components(components):
+    """Strip component names and reject blanks or duplicates, which would share score keys"""
+    cleaned = []
+    for c in components:
+        name = str(c['name']).strip()
+        if not name:
+            raise ValueError("Grade components need a name")
+        if any(other['name'] == name for other in cleaned):
+            raise ValueError(f"Grade component '{name}' is listed more than once")
+        cleaned.append(dict(c, name=name))
+    return cleaned
+
+
+def add_course(name, code, credits, components=None):
+    with _lock:
+        name, code = name.strip(), code.strip()
+        if not name or not code:
+            raise ValueError("Course name and code are required")
+        catalog = load_catalog()
+        if code in catalog['by_code']:
+            raise ValueError(f"Course code '{code}' is already in use")
+        if name in catalog['by_name']:
+            raise ValueError(f"A course named '{name}' already exists")
+        course = {
+            'name': name,
+            'code': code,
+            'credits': credits,
+            'components': _clean_components(components or DEFAULT_COMPONENTS),
+            'scores': {},
+        }
+        course['grade'] = compute_grade(course['components'], course['scores'])
+        _append(course)
+        return catalog['by_code'][code]
+
+
+def update_course(code, components=None, scores=None):
+    """Change a course's grade setup or scores; only that course's grade is recomputed.
+
+    Returns the new record. Records are replaced rather than edited in place,
+    so callers should keep using the returned dict.
+    """
+    with _lock:
+        course = dict(load_catalog()['by_code'][code])
+        if components is not None:
+            components = _clean_components(components)
+            course['components'] = components
+            # Drop scores for components that no longer exist
+            names = {c['name'] for c in components}
+            course['scores'] = {k: v for k, v in course.get('scores', {}).items() if k in names}
+        if scores is not None:
+            course['scores'] = dict(scores)
+        course.setdefault('components', [dict(c) for c in DEFAULT_COMPONENTS])
+        course['grade'] = compute_grade(course['components'], course.get('scores', {}))
+        _append(course)
+        return _catalog['by_code'][code]
+
+
+def course_grade(course):
+    """Cached grade for a course, computed once for records saved before grades were stored"""
+    with _lock:
+        if 'grade' not in course:
+            course.setdefault('components', [dict(c) for c in DEFAULT_COMPONENTS])
+            course['grade'] = compute_grade(course['components'], course.get('scores', {}))
+        return course['grade']
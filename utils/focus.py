@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from utils.helpers import load_data
+
+SESSIONS_FILE = "data/focus_sessions.jsonl"
+ROLLUPS_FILE = "data/focus_rollups.json"
+EVENTS = ("started", "stopped", "completed")
+
+# Every session thread appends through here; the lock keeps rollups in step with the log
+_lock = threading.Lock()
+
+
+def _empty_bucket():
+    return {'started': 0, 'stopped': 0, 'completed': 0, 'seconds': 0}
+
+
+def _week_key(day):
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _apply(rollups, record):
+    when = datetime.strptime(record['ts'], "%Y-%m-%d %H:%M:%S")
+    keys = {
+        'daily': when.strftime("%Y-%m-%d"),
+        'weekly': _week_key(when.date()),
+        'subject': record['subject'],
+    }
+    for level, key in keys.items():
+        bucket = rollups[level].setdefault(key, _empty_bucket())
+        bucket[record['event']] += 1
+        if record['event'] != "started":
+            bucket['seconds'] += record['elapsed']
+
+
+def load_rollups():
+    rollups = load_data("focus_rollups")
+    if not isinstance(rollups, dict):
+        rollups = {}
+    for level in ("daily", "weekly", "subject"):
+        rollups.setdefault(level, {})
+    return rollups
+
+
+def _save_rollups(rollups):
+    """Write through a temp file so a reader never sees a half-written file and falls back to {}"""
+    os.makedirs("data", exist_ok=True)
+    tmp = f"{ROLLUPS_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(rollups, f)
+    os.replace(tmp, ROLLUPS_FILE)
+
+
+def record_session_event(event, timer_type, subject, planned, elapsed=0, when=None):
+    """Append a timer event to the session log and fold it into the rollups"""
+    if event not in EVENTS:
+        raise ValueError(f"Unknown session event: {event}")
+    when = when or datetime.now()
+    subject = subject.strip() or "General"
+    record = {
+        'ts': when.strftime("%Y-%m-%d %H:%M:%S"),
+        'event': event,
+        'type': timer_type,
+        'subject': subject,
+        'planned': int(planned),
+        'elapsed': int(elapsed),
+    }
+
+    with _lock:
+        # The raw log is append-only, one JSON object per line
+        os.makedirs("data", exist_ok=True)
+        with open(SESSIONS_FILE, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+        rollups = load_rollups()
+        _apply(rollups, record)
+        _save_rollups(rollups)
+    return record
+
+
+def iter_sessions():
+    """Yield raw session events, skipping any line left half-written"""
+    try:
+        with open(SESSIONS_FILE, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def rebuild_rollups():
+    """Recompute the rollups from the raw log, e.g. after editing it by hand"""
+    with _lock:
+        rollups = {'daily': {}, 'weekly': {}, 'subject': {}}
+        for record in iter_sessions():
+            _apply(rollups, record)
+        _save_rollups(rollups)
+    return rollups
+
+
+def daily_series(rollups, days, today=None):
+    """One bucket per day for the last `days` days, oldest first, with gaps filled"""
+    today = today or datetime.now().date()
+    daily = rollups['daily']
+    series = []
+    for offset in range(days - 1, -1, -1):
+        day = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
+        series.append(dict(daily.get(day, _empty_bucket()), period=day))
+    return series
+
+
+def weekly_series(rollups, weeks, today=None):
+    today = today or datetime.now().date()
+    weekly = rollups['weekly']
+    series = []
+    for offset in range(weeks - 1, -1, -1):
+        week = _week_key(today - timedelta(weeks=offset))
+        series.append(dict(weekly.get(week, _empty_bucket()), period=week))
+    return series
+
+
+def subject_series(rollups):
+    return [dict(bucket, period=subject) for subject, bucket in sorted(rollups['subject'].items())]
@@ -10,9 +10,21 @@ def load_data(filename):
         return []
 
 def save_data(filename, data):
+    # Keep the dashboard summary in step with every write
+    from utils.summary import lock, update_summary
+
     os.makedirs("data", exist_ok=True)
-    with open(f"data/{filename}.json", "w") as f:
-        json.dump(data, f)
+    with lock:
+        with open(f"data/{filename}.json", "w") as f:
+            json.dump(data, f)
+        update_summary(filename, data)
+
+def data_version(filename):
+    """Changes whenever the file is rewritten; used to key cached reads"""
+    try:
+        return os.stat(f"data/{filename}.json").st_mtime_ns
+    except OSError:
+        return 0
 
 def get_subject_color(subject):
     """Generate a consistent color for each subject"""
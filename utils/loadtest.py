@@ -0,0 +1,321 @@
+"""Load-test the JSON storage layer with concurrent simulated sessions.
+
+Each session is a thread that behaves like one browser tab of the app: it
+adds and completes tasks, adds events, saves quick notes and browses notes
+through load_data/save_data. The run happens in a scratch copy of data/, so
+the real files are never touched.
+
+Two modes separate the two ways data goes missing:
+
+- stale: like app.py, tasks and events are loaded once into the session and
+  that snapshot is written back, so a second session clobbers the first even
+  when their writes never overlap.
+- fresh: every write reloads the file first, so any loss is a genuine
+  read-modify-write or torn-write race in the storage layer.
+
+    python -m utils.loadtest --sessions 1,2,4,8,16 --ops 200 --mode both
+"""
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from utils.helpers import load_data, save_data
+from utils.summary import SECTIONS
+
+OPERATIONS = {
+    "add_task": 30,
+    "complete_task": 20,
+    "add_event": 10,
+    "save_quick_note": 20,
+    "browse_notes": 20,
+}
+
+CHECKED_FILES = ("tasks", "events", "notes", "quick_notes", "summary")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _read_raw(filename):
+    """Read a data file without load_data's fallback so torn reads are visible"""
+    with open(f"data/{filename}.json", "r") as f:
+        return json.load(f)
+
+
+class Session(threading.Thread):
+    def __init__(self, session_id, ops, seed, start_barrier, fresh=False):
+        super().__init__(name=f"session-{session_id}")
+        self.session_id = session_id
+        self.ops = ops
+        self.rng = random.Random(seed)
+        self.start_barrier = start_barrier
+        self.fresh = fresh
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.torn_reads = 0
+        # What this session believes it wrote, checked against the files afterwards
+        self.written = {"tasks": set(), "completed": set(), "events": set(), "quick_notes": set()}
+
+    def run(self):
+        # Mirrors app.py: tasks and events are loaded once per session, and in
+        # stale mode that snapshot is what gets written back
+        self.tasks = load_data("tasks")
+        self.events = load_data("events")
+        self.start_barrier.wait()
+        names, weights = zip(*OPERATIONS.items())
+        for n in range(self.ops):
+            op = self.rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                getattr(self, op)(n)
+            except Exception:
+                self.errors[op] += 1
+            self.latencies[op].append(time.perf_counter() - started)
+
+    def _tag(self, n):
+        return f"s{self.session_id}-{n}"
+
+    def _reload(self, filename):
+        """Read the current file, counting torn reads that load_data would hide"""
+        try:
+            return _read_raw(filename)
+        except FileNotFoundError:
+            return []
+        except json.JSONDecodeError:
+            # load_data would silently return [] here and the next save wipes the file
+            self.torn_reads += 1
+            return []
+
+    def add_task(self, n):
+        tag = self._tag(n)
+        if self.fresh:
+            self.tasks = self._reload("tasks")
+        self.tasks.append({
+            "task": tag,
+            "priority": self.rng.choice(["🔴 High", "🟡 Medium", "🟢 Low"]),
+            "due_date": (datetime.now() + timedelta(days=self.rng.randint(-3, 14))).strftime("%Y-%m-%d"),
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "completed": False,
+        })
+        save_data("tasks", self.tasks)
+        self.written["tasks"].add(tag)
+
+    def complete_task(self, n):
+        if self.fresh:
+            self.tasks = self._reload("tasks")
+        mine = [t for t in self.tasks if t["task"] in self.written["tasks"] and not t.get("completed")]
+        if not mine:
+            return self.add_task(n)
+        task = self.rng.choice(mine)
+        task["completed"] = True
+        task["completed_at"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+        save_data("tasks", self.tasks)
+        self.written["completed"].add(task["task"])
+
+    def add_event(self, n):
+        tag = self._tag(n)
+        if self.fresh:
+            self.events = self._reload("events")
+        self.events.append({
+            "title": tag,
+            "date": (datetime.now() + timedelta(days=self.rng.randint(0, 60))).strftime("%Y-%m-%d"),
+            "type": "Other",
+            "priority": "Medium",
+            "description": "load test",
+        })
+        save_data("events", self.events)
+        self.written["events"].add(tag)
+
+    def save_quick_note(self, n):
+        # Quick Notes reloads the file on every rerun before appending, in both modes
+        tag = self._tag(n)
+        notes = self._reload("quick_notes")
+        notes.append({"content": tag, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M")})
+        save_data("quick_notes", notes)
+        self.written["quick_notes"].add(tag)
+
+    def browse_notes(self, n):
+        try:
+            notes = _read_raw("notes")
+        except json.JSONDecodeError:
+            self.torn_reads += 1
+            return
+        sorted(notes.items(), key=lambda x: x[1].get("date", ""), reverse=True)
+
+
+def _check_files():
+    """Return the files that no longer parse after the run"""
+    corrupt = []
+    for filename in CHECKED_FILES:
+        try:
+            _read_raw(filename)
+        except FileNotFoundError:
+            continue
+        except json.JSONDecodeError:
+            corrupt.append(filename)
+    return corrupt
+
+
+def _summary_mismatches():
+    """Return the dashboard summary sections that disagree with the final data files"""
+    try:
+        summary = _read_raw("summary")
+    except (FileNotFoundError, json.JSONDecodeError):
+        return list(SECTIONS)
+    # Read the summary as stored; get_summary would quietly repair it
+    mismatched = []
+    for filename, summarize in SECTIONS.items():
+        if summary.get(filename) != summarize(load_data(filename), date.today()):
+            mismatched.append(filename)
+    return mismatched
+
+
+def _lost_updates(sessions):
+    tasks = load_data("tasks")
+    events = load_data("events")
+    quick_notes = load_data("quick_notes")
+    stored = {
+        "tasks": {t.get("task") for t in tasks},
+        "completed": {t.get("task") for t in tasks if t.get("completed")},
+        "events": {e.get("title") for e in events},
+        "quick_notes": {q.get("content") for q in quick_notes},
+    }
+    lost = defaultdict(int)
+    for session in sessions:
+        for kind, tags in session.written.items():
+            if kind == "completed":
+                # A task that vanished entirely is already counted under "tasks"
+                tags = tags & stored["tasks"]
+            lost[kind] += len(tags - stored[kind])
+    return dict(lost)
+
+
+MODES = ("stale", "fresh")
+
+
+def run(concurrency, ops, seed=0, mode="stale"):
+    """Run one load test in the current directory and return its report"""
+    barrier = threading.Barrier(concurrency + 1)
+    sessions = [Session(i, ops, seed + i, barrier, fresh=mode == "fresh") for i in range(concurrency)]
+    for session in sessions:
+        session.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for session in sessions:
+        session.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    for session in sessions:
+        for op, values in session.latencies.items():
+            latencies[op].extend(values)
+        for op, count in session.errors.items():
+            errors[op] += count
+    every = [v for values in latencies.values() for v in values]
+
+    return {
+        "mode": mode,
+        "sessions": concurrency,
+        "ops": len(every),
+        "seconds": elapsed,
+        "throughput": len(every) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            op: {p: percentile(values, p) * 1000 for p in (50, 95, 99)}
+            for op, values in sorted(latencies.items())
+        },
+        "p50_ms": percentile(every, 50) * 1000,
+        "p95_ms": percentile(every, 95) * 1000,
+        "p99_ms": percentile(every, 99) * 1000,
+        "errors": dict(errors),
+        "torn_reads": sum(s.torn_reads for s in sessions),
+        "lost_updates": _lost_updates(sessions),
+        "corrupt_files": _check_files(),
+        "summary_mismatches": _summary_mismatches(),
+    }
+
+
+def run_isolated(concurrency, ops, seed=0, source="data", mode="stale"):
+    """Run against a scratch copy of `source` so the real data files are untouched"""
+    source = os.path.abspath(source)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(scratch, "data"))
+        os.chdir(scratch)
+        try:
+            return run(concurrency, ops, seed, mode)
+        finally:
+            os.chdir(cwd)
+
+
+def is_broken(report):
+    return bool(sum(report["lost_updates"].values()) or report["corrupt_files"] or report["torn_reads"]
+                or report["summary_mismatches"])
+
+
+def format_report(report):
+    broken = "yes" if is_broken(report) else "no"
+    lines = [
+        f"mode={report['mode']}  sessions={report['sessions']}  ops={report['ops']}  "
+        f"throughput={report['throughput']:.1f} ops/s  "
+        f"p50={report['p50_ms']:.2f}ms  p95={report['p95_ms']:.2f}ms  p99={report['p99_ms']:.2f}ms",
+        f"  lost updates: {report['lost_updates']}  torn reads: {report['torn_reads']}  "
+        f"corrupt files: {report['corrupt_files'] or 'none'}  "
+        f"summary mismatches: {report['summary_mismatches'] or 'none'}  errors: {report['errors'] or 'none'}  "
+        f"broken: {broken}",
+    ]
+    for op, pcts in report["latency_ms"].items():
+        lines.append(f"  {op:<16} p50={pcts[50]:.2f}ms  p95={pcts[95]:.2f}ms  p99={pcts[99]:.2f}ms")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the data/*.json storage layer")
+    parser.add_argument("--sessions", default="1,2,4,8,16",
+                        help="comma-separated concurrency levels to run")
+    parser.add_argument("--ops", type=int, default=200, help="operations per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", default="data", help="directory to copy as the starting data")
+    parser.add_argument("--mode", choices=MODES + ("both",), default="both",
+                        help="stale: write back per-session snapshots like the app; "
+                             "fresh: reload before every write to isolate storage races")
+    parser.add_argument("--json", action="store_true", help="print raw reports as JSON")
+    args = parser.parse_args()
+
+    modes = MODES if args.mode == "both" else (args.mode,)
+    reports = []
+    for mode in modes:
+        for concurrency in (int(c) for c in args.sessions.split(",")):
+            report = run_isolated(concurrency, args.ops, args.seed, args.data, mode)
+            reports.append(report)
+            if not args.json:
+                print(format_report(report))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return
+    print()
+    for mode in modes:
+        first_broken = next((r["sessions"] for r in reports if r["mode"] == mode and is_broken(r)), None)
+        if first_broken:
+            print(f"{mode}: first lost or corrupted data at {first_broken} concurrent sessions")
+        else:
+            print(f"{mode}: no lost updates or corruption at the tested concurrency levels")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+from utils.helpers import data_version, load_data
+
+SUMMARY_FILE = "data/summary.json"
+
+# Held by save_data around the data-file write and the section update, so
+# concurrent sessions cannot interleave or land an older section last
+lock = threading.RLock()
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _completion_rate(tasks, today, days):
+    """Share of tasks due or completed in the last `days` days that are done"""
+    start = today - timedelta(days=days - 1)
+    relevant = completed = 0
+    for t in tasks:
+        due = _parse_date(t.get('due_date'))
+        done_on = _parse_date(t.get('completed_at')) or due
+        in_window = due is not None and start <= due <= today
+        if t.get('completed', False):
+            in_window = in_window or (done_on is not None and start <= done_on <= today)
+            completed += in_window
+        relevant += in_window
+    return round(100 * completed / relevant) if relevant else None
+
+
+def _summarize_tasks(tasks, today):
+    pending_due = [
+        d for d in (_parse_date(t.get('due_date')) for t in tasks if not t.get('completed', False))
+        if d is not None
+    ]
+    upcoming = [d for d in pending_due if d >= today]
+    return {
+        'pending_tasks': len(tasks) - sum(1 for t in tasks if t.get('completed', False)),
+        'overdue_tasks': sum(1 for d in pending_due if d < today),
+        'next_deadline': min(upcoming).isoformat() if upcoming else None,
+        'completion_rate_7d': _completion_rate(tasks, today, 7),
+        'completion_rate_30d': _completion_rate(tasks, today, 30),
+    }
+
+
+def _summarize_events(events, today):
+    dates = [_parse_date(e.get('date')) for e in events]
+    upcoming = [d for d in dates if d is not None and d >= today]
+    return {
+        'upcoming_events': len(upcoming),
+        'next_event': min(upcoming).isoformat() if upcoming else None,
+    }
+
+
+def _summarize_notes(notes, today):
+    return {'notes': len(notes)}
+
+
+SECTIONS = {
+    "tasks": _summarize_tasks,
+    "events": _summarize_events,
+    "notes": _summarize_notes,
+}
+
+
+def _write_summary(summary):
+    """Write through a temp file so readers never see a half-written summary"""
+    os.makedirs("data", exist_ok=True)
+    tmp = f"{SUMMARY_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(summary, f)
+    os.replace(tmp, SUMMARY_FILE)
+
+
+def _read_summary():
+    try:
+        with open(SUMMARY_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _refresh_section(summary, filename, data, today):
+    summary[filename] = SECTIONS[filename](data, today)
+    # Remember which version of the file the section was computed from
+    summary.setdefault('versions', {})[filename] = data_version(filename)
+
+
+def rebuild_summary():
+    """Recompute every section from the stored collections"""
+    with lock:
+        today = date.today()
+        summary = {'as_of': today.isoformat(), 'versions': {}}
+        for filename in SECTIONS:
+            _refresh_section(summary, filename, load_data(filename), today)
+        _write_summary(summary)
+        return summary
+
+
+def update_summary(filename, data):
+    """Refresh only the section belonging to the collection that was just written.
+
+    Callers hold `lock` across the data-file write and this call, so the
+    section always matches the file on disk.
+    """
+    if filename not in SECTIONS:
+        return
+    with lock:
+        today = date.today()
+        summary = _read_summary()
+        if summary.get('as_of') != today.isoformat():
+            # Overdue counts and rolling windows depend on the date, so start the day fresh
+            rebuild_summary()
+            return
+        _refresh_section(summary, filename, data, today)
+        _write_summary(summary)
+
+
+def get_summary():
+    """Return the flattened dashboard summary, rebuilding it at most once a day.
+
+    Sections whose source file changed since they were computed are
+    recomputed, so a summary that drifted from the data repairs itself.
+    """
+    with lock:
+        summary = _read_summary()
+        if summary.get('as_of') != date.today().isoformat():
+            summary = rebuild_summary()
+        versions = summary.get('versions', {})
+        stale = [f for f in SECTIONS if f not in summary or versions.get(f) != data_version(f)]
+        if stale:
+            today = date.today()
+            for filename in stale:
+                _refresh_section(summary, filename, load_data(filename), today)
+            _write_summary(summary)
+    flat = {'as_of': summary['as_of']}
+    for section in SECTIONS:
+        flat.update(summary[section])
+    return flat